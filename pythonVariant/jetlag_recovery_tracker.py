@@ -10,108 +10,226 @@ import warnings
 warnings.filterwarnings('ignore', message='urllib3 v2 only supports OpenSSL 1.1.1+')
 
 import requests
+import hashlib
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import sys
 import os
-from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import IntFlag
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 import time
 
+try:
+    import orjson  # Optional: considerably faster parsing of large heart rate payloads
+except ImportError:
+    orjson = None
+
+# Recovery trend row templates, shared by every row of the report
+TREND_BASELINE_TEMPLATE = "   Day {:2d}: {:5.1f}% (Baseline)"
+TREND_SCORE_TEMPLATE = "   Day {:2d}: {:5.1f}%"
+TREND_NO_DATA_TEMPLATE = "   Day {:2d}: No data"
+
+# Recovery status emoji by minimum score, highest first; lower scores show 🔴
+RECOVERY_STATUS_EMOJI = ((90, "🎯"), (70, "🔶"))
+
+
+@lru_cache(maxsize=64)
+def parse_day(value: str) -> date:
+    """Parse a YYYY-MM-DD date string, caching results as the same days are looked up repeatedly."""
+    # Fixed-width fields are sliced directly rather than going through strptime's format parser
+    return date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+
+
+def split_timestamp(value: str) -> Tuple[datetime, int]:
+    """Split a 'YYYY-MM-DDTHH:MM:SS' timestamp with a 'Z' or '±HH:MM' suffix into its naive
+    wall-clock time and UTC offset in minutes, raising ValueError for any other layout."""
+    # Slicing the fixed-width fields is much cheaper than fromisoformat's generic parsing
+    wall = datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                    int(value[11:13]), int(value[14:16]), int(value[17:19]))
+    zone = value[19:]
+    if zone == 'Z':
+        return wall, 0
+    if len(zone) == 6 and zone[0] in '+-' and zone[3] == ':':
+        offset = int(zone[1:3]) * 60 + int(zone[4:6])
+        return wall, -offset if zone[0] == '-' else offset
+    raise ValueError(f"Unsupported timestamp format: {value}")
+
+
+class RateLimiter:
+    """Thread-safe token bucket keeping request rate under the API limit while allowing short bursts."""
+    
+    def __init__(self, max_per_second: float, burst: int):
+        self.rate = max_per_second
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a request token is available."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Claim a token now; if the bucket is empty, wait for it to refill
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+@dataclass
+class Airport:
+    """Timezone and location details for a supported airport."""
+    __slots__ = ('iata', 'city', 'name', 'timezone', 'offset', 'longitude')
+    iata: str
+    city: str
+    name: str
+    timezone: str
+    offset: int
+    longitude: float
+
+
+class RouteDetails(NamedTuple):
+    """Airports, timezone shift and direction of travel for a route."""
+    departure: Airport
+    arrival: Airport
+    timezone_shift: int
+    direction: str
+
+
+# Airport timezone database, built once at import and shared read-only by every AirportDatabase
+_AIRPORT_INFO = {
+    # Major UK airports
+    'LHR': {'timezone': 'Europe/London', 'offset': 0, 'city': 'London', 'longitude': -0.4543, 'name': 'Heathrow'},
+    'LGW': {'timezone': 'Europe/London', 'offset': 0, 'city': 'London', 'longitude': -0.1821, 'name': 'Gatwick'},
+    'STN': {'timezone': 'Europe/London', 'offset': 0, 'city': 'London', 'longitude': 0.235, 'name': 'Stansted'},
+    'LTN': {'timezone': 'Europe/London', 'offset': 0, 'city': 'London', 'longitude': -0.3686, 'name': 'Luton'},
+    'MAN': {'timezone': 'Europe/London', 'offset': 0, 'city': 'Manchester', 'longitude': -2.2750, 'name': 'Manchester'},
+    'EDI': {'timezone': 'Europe/London', 'offset': 0, 'city': 'Edinburgh', 'longitude': -3.3725, 'name': 'Edinburgh'},
+    
+    # Major US airports
+    'LAX': {'timezone': 'America/Los_Angeles', 'offset': -8, 'city': 'Los Angeles', 'longitude': -118.4085, 'name': 'Los Angeles Intl'},
+    'SFO': {'timezone': 'America/Los_Angeles', 'offset': -8, 'city': 'San Francisco', 'longitude': -122.3875, 'name': 'San Francisco Intl'},
+    'JFK': {'timezone': 'America/New_York', 'offset': -5, 'city': 'New York', 'longitude': -73.7781, 'name': 'John F Kennedy Intl'},
+    'LGA': {'timezone': 'America/New_York', 'offset': -5, 'city': 'New York', 'longitude': -73.8740, 'name': 'LaGuardia'},
+    'EWR': {'timezone': 'America/New_York', 'offset': -5, 'city': 'Newark', 'longitude': -74.1745, 'name': 'Newark Liberty Intl'},
+    'ORD': {'timezone': 'America/Chicago', 'offset': -6, 'city': 'Chicago', 'longitude': -87.9073, 'name': 'O\'Hare Intl'},
+    'DFW': {'timezone': 'America/Chicago', 'offset': -6, 'city': 'Dallas', 'longitude': -97.0372, 'name': 'Dallas/Fort Worth Intl'},
+    'DEN': {'timezone': 'America/Denver', 'offset': -7, 'city': 'Denver', 'longitude': -104.6737, 'name': 'Denver Intl'},
+    'SEA': {'timezone': 'America/Los_Angeles', 'offset': -8, 'city': 'Seattle', 'longitude': -122.3088, 'name': 'Seattle-Tacoma Intl'},
+    
+    # Major European airports
+    'CDG': {'timezone': 'Europe/Paris', 'offset': 1, 'city': 'Paris', 'longitude': 2.5479, 'name': 'Charles de Gaulle'},
+    'FRA': {'timezone': 'Europe/Berlin', 'offset': 1, 'city': 'Frankfurt', 'longitude': 8.5622, 'name': 'Frankfurt am Main'},
+    'AMS': {'timezone': 'Europe/Amsterdam', 'offset': 1, 'city': 'Amsterdam', 'longitude': 4.7683, 'name': 'Amsterdam Schiphol'},
+    'MAD': {'timezone': 'Europe/Madrid', 'offset': 1, 'city': 'Madrid', 'longitude': -3.5676, 'name': 'Madrid-Barajas'},
+    'BCN': {'timezone': 'Europe/Madrid', 'offset': 1, 'city': 'Barcelona', 'longitude': 2.0833, 'name': 'Barcelona-El Prat'},
+    'FCO': {'timezone': 'Europe/Rome', 'offset': 1, 'city': 'Rome', 'longitude': 12.2389, 'name': 'Rome Fiumicino'},
+    'ZUR': {'timezone': 'Europe/Zurich', 'offset': 1, 'city': 'Zurich', 'longitude': 8.5494, 'name': 'Zurich'},
+    
+    # Asian airports
+    'NRT': {'timezone': 'Asia/Tokyo', 'offset': 9, 'city': 'Tokyo', 'longitude': 140.3864, 'name': 'Narita Intl'},
+    'HND': {'timezone': 'Asia/Tokyo', 'offset': 9, 'city': 'Tokyo', 'longitude': 139.7798, 'name': 'Haneda'},
+    'ICN': {'timezone': 'Asia/Seoul', 'offset': 9, 'city': 'Seoul', 'longitude': 126.4417, 'name': 'Incheon Intl'},
+    'SIN': {'timezone': 'Asia/Singapore', 'offset': 8, 'city': 'Singapore', 'longitude': 103.9915, 'name': 'Singapore Changi'},
+    'HKG': {'timezone': 'Asia/Hong_Kong', 'offset': 8, 'city': 'Hong Kong', 'longitude': 113.9185, 'name': 'Hong Kong Intl'},
+    'PEK': {'timezone': 'Asia/Shanghai', 'offset': 8, 'city': 'Beijing', 'longitude': 116.5975, 'name': 'Beijing Capital Intl'},
+    'PVG': {'timezone': 'Asia/Shanghai', 'offset': 8, 'city': 'Shanghai', 'longitude': 121.8058, 'name': 'Shanghai Pudong Intl'},
+    
+    # Australian airports
+    'SYD': {'timezone': 'Australia/Sydney', 'offset': 10, 'city': 'Sydney', 'longitude': 151.1772, 'name': 'Sydney Kingsford Smith'},
+    'MEL': {'timezone': 'Australia/Melbourne', 'offset': 10, 'city': 'Melbourne', 'longitude': 144.8432, 'name': 'Melbourne'},
+    'PER': {'timezone': 'Australia/Perth', 'offset': 8, 'city': 'Perth', 'longitude': 115.9669, 'name': 'Perth'}
+}
+_AIRPORTS = MappingProxyType({code: Airport(iata=code, **info) for code, info in _AIRPORT_INFO.items()})
+
+
+@lru_cache(maxsize=256)
+def _route_details(departure_code: str, arrival_code: str) -> RouteDetails:
+    """Calculate route details between two airports in the shared table (cached per route)."""
+    departure_info = _AIRPORTS.get(departure_code)
+    arrival_info = _AIRPORTS.get(arrival_code)
+    
+    if not departure_info or not arrival_info:
+        raise ValueError(f"Airport data not available for {departure_code if not departure_info else arrival_code}")
+    
+    # Calculate timezone shift
+    timezone_shift = arrival_info.offset - departure_info.offset
+    
+    # Determine direction based on longitude
+    direction = 'east' if arrival_info.longitude > departure_info.longitude else 'west'
+    
+    return RouteDetails(departure_info, arrival_info, timezone_shift, direction)
+
 
 class AirportDatabase:
     """Handles airport timezone information and route calculations."""
     
     def __init__(self):
-        # Airport timezone database
-        self.airports = {
-            # Major UK airports
-            'LHR': {'timezone': 'Europe/London', 'offset': 0, 'city': 'London', 'longitude': -0.4543, 'name': 'Heathrow'},
-            'LGW': {'timezone': 'Europe/London', 'offset': 0, 'city': 'London', 'longitude': -0.1821, 'name': 'Gatwick'},
-            'STN': {'timezone': 'Europe/London', 'offset': 0, 'city': 'London', 'longitude': 0.235, 'name': 'Stansted'},
-            'LTN': {'timezone': 'Europe/London', 'offset': 0, 'city': 'London', 'longitude': -0.3686, 'name': 'Luton'},
-            'MAN': {'timezone': 'Europe/London', 'offset': 0, 'city': 'Manchester', 'longitude': -2.2750, 'name': 'Manchester'},
-            'EDI': {'timezone': 'Europe/London', 'offset': 0, 'city': 'Edinburgh', 'longitude': -3.3725, 'name': 'Edinburgh'},
-            
-            # Major US airports
-            'LAX': {'timezone': 'America/Los_Angeles', 'offset': -8, 'city': 'Los Angeles', 'longitude': -118.4085, 'name': 'Los Angeles Intl'},
-            'SFO': {'timezone': 'America/Los_Angeles', 'offset': -8, 'city': 'San Francisco', 'longitude': -122.3875, 'name': 'San Francisco Intl'},
-            'JFK': {'timezone': 'America/New_York', 'offset': -5, 'city': 'New York', 'longitude': -73.7781, 'name': 'John F Kennedy Intl'},
-            'LGA': {'timezone': 'America/New_York', 'offset': -5, 'city': 'New York', 'longitude': -73.8740, 'name': 'LaGuardia'},
-            'EWR': {'timezone': 'America/New_York', 'offset': -5, 'city': 'Newark', 'longitude': -74.1745, 'name': 'Newark Liberty Intl'},
-            'ORD': {'timezone': 'America/Chicago', 'offset': -6, 'city': 'Chicago', 'longitude': -87.9073, 'name': 'O\'Hare Intl'},
-            'DFW': {'timezone': 'America/Chicago', 'offset': -6, 'city': 'Dallas', 'longitude': -97.0372, 'name': 'Dallas/Fort Worth Intl'},
-            'DEN': {'timezone': 'America/Denver', 'offset': -7, 'city': 'Denver', 'longitude': -104.6737, 'name': 'Denver Intl'},
-            'SEA': {'timezone': 'America/Los_Angeles', 'offset': -8, 'city': 'Seattle', 'longitude': -122.3088, 'name': 'Seattle-Tacoma Intl'},
-            
-            # Major European airports
-            'CDG': {'timezone': 'Europe/Paris', 'offset': 1, 'city': 'Paris', 'longitude': 2.5479, 'name': 'Charles de Gaulle'},
-            'FRA': {'timezone': 'Europe/Berlin', 'offset': 1, 'city': 'Frankfurt', 'longitude': 8.5622, 'name': 'Frankfurt am Main'},
-            'AMS': {'timezone': 'Europe/Amsterdam', 'offset': 1, 'city': 'Amsterdam', 'longitude': 4.7683, 'name': 'Amsterdam Schiphol'},
-            'MAD': {'timezone': 'Europe/Madrid', 'offset': 1, 'city': 'Madrid', 'longitude': -3.5676, 'name': 'Madrid-Barajas'},
-            'BCN': {'timezone': 'Europe/Madrid', 'offset': 1, 'city': 'Barcelona', 'longitude': 2.0833, 'name': 'Barcelona-El Prat'},
-            'FCO': {'timezone': 'Europe/Rome', 'offset': 1, 'city': 'Rome', 'longitude': 12.2389, 'name': 'Rome Fiumicino'},
-            'ZUR': {'timezone': 'Europe/Zurich', 'offset': 1, 'city': 'Zurich', 'longitude': 8.5494, 'name': 'Zurich'},
-            
-            # Asian airports
-            'NRT': {'timezone': 'Asia/Tokyo', 'offset': 9, 'city': 'Tokyo', 'longitude': 140.3864, 'name': 'Narita Intl'},
-            'HND': {'timezone': 'Asia/Tokyo', 'offset': 9, 'city': 'Tokyo', 'longitude': 139.7798, 'name': 'Haneda'},
-            'ICN': {'timezone': 'Asia/Seoul', 'offset': 9, 'city': 'Seoul', 'longitude': 126.4417, 'name': 'Incheon Intl'},
-            'SIN': {'timezone': 'Asia/Singapore', 'offset': 8, 'city': 'Singapore', 'longitude': 103.9915, 'name': 'Singapore Changi'},
-            'HKG': {'timezone': 'Asia/Hong_Kong', 'offset': 8, 'city': 'Hong Kong', 'longitude': 113.9185, 'name': 'Hong Kong Intl'},
-            'PEK': {'timezone': 'Asia/Shanghai', 'offset': 8, 'city': 'Beijing', 'longitude': 116.5975, 'name': 'Beijing Capital Intl'},
-            'PVG': {'timezone': 'Asia/Shanghai', 'offset': 8, 'city': 'Shanghai', 'longitude': 121.8058, 'name': 'Shanghai Pudong Intl'},
-            
-            # Australian airports
-            'SYD': {'timezone': 'Australia/Sydney', 'offset': 10, 'city': 'Sydney', 'longitude': 151.1772, 'name': 'Sydney Kingsford Smith'},
-            'MEL': {'timezone': 'Australia/Melbourne', 'offset': 10, 'city': 'Melbourne', 'longitude': 144.8432, 'name': 'Melbourne'},
-            'PER': {'timezone': 'Australia/Perth', 'offset': 8, 'city': 'Perth', 'longitude': 115.9669, 'name': 'Perth'}
-        }
+        self.airports = _AIRPORTS
     
-    def calculate_route_details(self, departure_code: str, arrival_code: str) -> Dict:
+    def calculate_route_details(self, departure_code: str, arrival_code: str) -> RouteDetails:
         """Calculate route details from airport codes."""
-        departure_info = self.airports.get(departure_code)
-        arrival_info = self.airports.get(arrival_code)
-        
-        if not departure_info or not arrival_info:
-            raise ValueError(f"Airport data not available for {departure_code if not departure_info else arrival_code}")
-        
-        # Calculate timezone shift
-        timezone_shift = arrival_info['offset'] - departure_info['offset']
-        
-        # Determine direction based on longitude
-        direction = 'east' if arrival_info['longitude'] > departure_info['longitude'] else 'west'
-        
-        return {
-            'departure': {
-                'iata': departure_code,
-                'city': departure_info['city'],
-                'name': departure_info['name'],
-                'timezone': departure_info['timezone']
-            },
-            'arrival': {
-                'iata': arrival_code,
-                'city': arrival_info['city'],
-                'name': arrival_info['name'],
-                'timezone': arrival_info['timezone']
-            },
-            'timezone_shift': timezone_shift,
-            'direction': direction
-        }
+        # Cached at module level so the cache does not hold on to AirportDatabase instances
+        return _route_details(departure_code, arrival_code)
 
 
 class OuraAPIClient:
     """Handles all interactions with the Oura Ring API."""
     
     BASE_URL = "https://api.ouraring.com/v2"
+    ENDPOINT_URLS = {
+        'personal_info': f"{BASE_URL}/usercollection/personal_info",
+        'sleep': f"{BASE_URL}/usercollection/sleep",
+        'daily_readiness': f"{BASE_URL}/usercollection/daily_readiness",
+        'daily_activity': f"{BASE_URL}/usercollection/daily_activity",
+        'heartrate': f"{BASE_URL}/usercollection/heartrate"
+    }
+    MAX_WORKERS = 8  # Concurrent requests in flight
+    MAX_REQUESTS_PER_SECOND = 15  # Oura allows 5000 requests per 5 minutes (~16/s)
+    CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'jetlag')
+    RECENT_CACHE_TTL = 6 * 60 * 60  # Seconds; Oura may still revise the last week's data
+    SETTLED_AFTER_DAYS = 7  # Entries fetched this many days after their day are cached indefinitely
     
-    def __init__(self, token: str):
+    def __init__(self, token: str, verbose: bool = False):
         self.token = token
+        self.verbose = verbose  # Print endpoint diagnostics while verifying access
         self.headers = {
             'Authorization': f'Bearer {token}',
             'Content-Type': 'application/json'
         }
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        self.session.headers['Connection'] = 'keep-alive'
+        
+        # Keep enough pooled connections for every worker thread so concurrent requests
+        # reuse TLS connections, and retry transient failures (honouring Retry-After on 429)
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=self.MAX_WORKERS, pool_maxsize=self.MAX_WORKERS,
+                              max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.rate_limiter = RateLimiter(self.MAX_REQUESTS_PER_SECOND, burst=self.MAX_WORKERS)
+    
+    @staticmethod
+    def parse_json(response: requests.Response):
+        """Decode a JSON response body, using orjson when it is installed."""
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
+    
+    def _get(self, url: str, params: Optional[Dict] = None) -> requests.Response:
+        """Issue a rate-limited GET on the shared session (safe to call from worker threads)."""
+        self.rate_limiter.acquire()
+        return self.session.get(url, params=params)
     
     def verify_endpoints(self) -> bool:
         """Verify API access and endpoint availability."""
@@ -119,44 +237,46 @@ class OuraAPIClient:
         
         try:
             # Test personal info endpoint
-            response = self.session.get(f"{self.BASE_URL}/usercollection/personal_info")
+            response = self.session.get(self.ENDPOINT_URLS['personal_info'])
             if response.status_code == 200:
-                user_info = response.json()
+                user_info = self.parse_json(response)
                 print(f"✅ API access verified for: {user_info.get('email', 'Unknown user')}")
                 
-                # Test sleep API with recent date and detailed debugging
-                test_date = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-                print(f"🔍 Testing sleep API with date: {test_date}")
-                sleep_response = self.session.get(f"{self.BASE_URL}/usercollection/sleep", 
-                                                params={'start_date': test_date, 'end_date': test_date})
-                print(f"   Sleep API test: {sleep_response.status_code}")
+                # Test sleep API over the last 7 days; the single-day count is derived locally
+                test_date = (date.today() - timedelta(days=1)).isoformat()
+                week_ago = (date.today() - timedelta(days=7)).isoformat()
+                if self.verbose:
+                    print(f"🔍 Testing sleep API with date range: {week_ago} to {test_date}")
+                
+                # Issue the sleep and activity probes together; results are reported in order below
+                probe_params = {'start_date': week_ago, 'end_date': test_date}
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    sleep_future = executor.submit(self._get, self.ENDPOINT_URLS['sleep'], probe_params)
+                    activity_future = executor.submit(self._get, self.ENDPOINT_URLS['daily_activity'], probe_params)
+                    sleep_response = sleep_future.result()
+                    activity_response = activity_future.result()
+                
+                if self.verbose:
+                    print(f"   Sleep API test: {sleep_response.status_code}")
                 if sleep_response.status_code == 200:
-                    sleep_data = sleep_response.json()
-                    print(f"   Sleep records found: {len(sleep_data.get('data', []))}")
-                    
-                    # Try a broader date range (last 7 days)
-                    week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-                    print(f"🔍 Testing broader date range: {week_ago} to {test_date}")
-                    broad_response = self.session.get(f"{self.BASE_URL}/usercollection/sleep", 
-                                                    params={'start_date': week_ago, 'end_date': test_date})
-                    if broad_response.status_code == 200:
-                        broad_data = broad_response.json()
-                        print(f"   7-day sleep records: {len(broad_data.get('data', []))}")
-                        if broad_data.get('data'):
-                            print(f"   Sample sleep record keys: {list(broad_data['data'][0].keys())}")
-                    
-                    # Test activity API
-                    print(f"🔍 Testing activity API...")
-                    activity_response = self.session.get(f"{self.BASE_URL}/usercollection/daily_activity", 
-                                                       params={'start_date': week_ago, 'end_date': test_date})
-                    print(f"   Activity API test: {activity_response.status_code}")
-                    if activity_response.status_code == 200:
-                        activity_data = activity_response.json()
+                    if self.verbose:
+                        sleep_records = self.parse_json(sleep_response).get('data', [])
+                        latest_records = [record for record in sleep_records if record.get('day') == test_date]
+                        print(f"   Sleep records found for {test_date}: {len(latest_records)}")
+                        print(f"   7-day sleep records: {len(sleep_records)}")
+                        if sleep_records:
+                            print(f"   Sample sleep record keys: {list(sleep_records[0].keys())}")
+                        
+                        # Activity API probe result
+                        print(f"🔍 Testing activity API...")
+                        print(f"   Activity API test: {activity_response.status_code}")
+                    if activity_response.status_code != 200:
+                        print(f"   Activity API error: {activity_response.text[:200]}")
+                    elif self.verbose:
+                        activity_data = self.parse_json(activity_response)
                         print(f"   Activity records found: {len(activity_data.get('data', []))}")
                         if activity_data.get('data'):
                             print(f"   Sample activity keys: {list(activity_data['data'][0].keys())}")
-                    else:
-                        print(f"   Activity API error: {activity_response.text[:200]}")
                         
                 else:
                     print(f"   Sleep API error: {sleep_response.text[:200]}")
@@ -169,152 +289,235 @@ class OuraAPIClient:
                 print(f"❌ API verification failed with status {response.status_code}")
                 return False
                 
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
+            # ValueError covers non-JSON bodies (e.g. a proxy page) under either JSON decoder
             print(f"❌ Network error during API verification: {e}")
             return False
     
-    def get_sleep_data(self, date: str) -> Optional[Dict]:
-        """Fetch sleep data for a specific date using a broader date range."""
+    def _cache_path(self, endpoint: str, day: str, keep: Optional[Callable[[Dict], bool]] = None) -> str:
+        """Build the cache file path for one day of an endpoint, keyed by token, endpoint, day and filter."""
+        key = json.dumps([hashlib.sha256(self.token.encode()).hexdigest(), endpoint, day,
+                          keep.__name__ if keep is not None else None])
+        return os.path.join(self.CACHE_DIR, f"{hashlib.sha256(key.encode()).hexdigest()}.json")
+    
+    def _read_cache(self, path: str, settled_at: float) -> Optional[List[Dict]]:
+        """Load cached records, returning None on a miss or an expired or unreadable entry.
+        
+        Entries fetched at or after settled_at (a Unix time) never expire; earlier ones may predate
+        the ring syncing, so they expire after RECENT_CACHE_TTL.
+        """
         try:
-            # Use a 3-day window centered on the target date to handle timezone issues
-            target_date = datetime.strptime(date, '%Y-%m-%d')
-            start_date = (target_date - timedelta(days=1)).strftime('%Y-%m-%d')
-            end_date = (target_date + timedelta(days=1)).strftime('%Y-%m-%d')
-            
-            url = f"{self.BASE_URL}/usercollection/sleep"
-            params = {'start_date': start_date, 'end_date': end_date}
-            response = self.session.get(url, params=params)
-            
-            print(f"    Sleep API: {response.status_code}", end="")
-            
-            if response.status_code == 200:
-                data = response.json()
-                all_records = data.get('data', [])
-                print(f" ({len(all_records)} records)", end="")
+            with open(path, 'rb') as f:
+                content = f.read()
+            entry = orjson.loads(content) if orjson is not None else json.loads(content)
+            fetched_at = entry['fetched_at']
+            if fetched_at < settled_at and time.time() - fetched_at > self.RECENT_CACHE_TTL:
+                return None
+            return entry['records']
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    def _write_cache(self, path: str, records: List[Dict]):
+        """Store records atomically, readable only by the owner (they contain health data)."""
+        try:
+            os.makedirs(self.CACHE_DIR, mode=0o700, exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump({'fetched_at': time.time(), 'records': records}, f)
+            os.chmod(temp_path, 0o600)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not cache API response: {e}")
+    
+    @staticmethod
+    def _range_params(endpoint: str, start: str, end: str) -> Dict:
+        """Build query parameters for a range of whole days (heart rate is queried by datetime)."""
+        if endpoint == 'heartrate':
+            return {'start_datetime': f"{start}T00:00:00", 'end_datetime': f"{end}T23:59:59"}
+        return {'start_date': start, 'end_date': end}
+    
+    @staticmethod
+    def _record_day(record: Dict) -> str:
+        """Day a record belongs to: its 'day' field, or the date of its timestamp for heart rate."""
+        return record.get('day') or record.get('timestamp', '')[:10]
+    
+    def _fetch_range(self, endpoint: str, params: Dict,
+                     keep: Optional[Callable[[Dict], bool]] = None) -> Tuple[List[Dict], bool]:
+        """Request a range from the API, returning its records and whether every page was fetched.
+        
+        When a keep predicate is given, each page is filtered as it arrives so only matching
+        records are held onto.
+        """
+        url = self.ENDPOINT_URLS[endpoint]
+        records = []
+        try:
+            while True:
+                response = self._get(url, params=params)
+                if response.status_code != 200:
+                    print(f"Warning: {endpoint} fetch failed with status {response.status_code}")
+                    return records, False
                 
-                # Find record that matches our target date
-                for record in all_records:
-                    record_date = record.get('day', '')
-                    if record_date == date:
-                        efficiency = record.get('efficiency', 'N/A')
-                        print(f" [Eff: {efficiency}%]", end="")
-                        return record
+                data = self.parse_json(response)
+                page = data.get('data', [])
+                records.extend(page if keep is None else filter(keep, page))
                 
-                # If no exact match, check if we have records from adjacent dates
-                if all_records:
-                    print(f" [Using closest: {all_records[0].get('day', 'unknown')}]", end="")
-                    return all_records[0]  # Use the first available record
-                else:
-                    print(" [No sleep data]", end="")
-                    return None
+                # Long ranges (notably heart rate) are paginated
+                next_token = data.get('next_token')
+                if not next_token:
+                    return records, True
+                params = {**params, 'next_token': next_token}
+        except (requests.RequestException, ValueError) as e:
+            # Connection errors, 429s and 5xx have already been retried with backoff by the session
+            print(f"Warning: {endpoint} data fetch failed: {e}")
+            return records, False
+    
+    def get_range(self, endpoint: str, start: str, end: str,
+                  keep: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+        """Fetch all records for an endpoint across a range of days in a single request.
+        
+        Past days are cached on disk per day, so a later run only requests the days it has not
+        already seen. An entry fetched within SETTLED_AFTER_DAYS of its day expires after
+        RECENT_CACHE_TTL, as Oura may still have been syncing or revising it. Today's data is still
+        changing, so it is always fetched live. An optional keep predicate discards unwanted
+        records page by page, before they are cached.
+        """
+        today = date.today()
+        first_day, last_day = parse_day(start), parse_day(end)
+        
+        # Serve the leading run of cached days; everything from the first miss onwards is fetched
+        records = []
+        fetch_from = first_day
+        while fetch_from <= last_day and fetch_from < today:
+            # Judge freshness by when the entry was fetched, not how old the day is now
+            settled = fetch_from + timedelta(days=self.SETTLED_AFTER_DAYS)
+            settled_at = datetime(settled.year, settled.month, settled.day).timestamp()
+            cached = self._read_cache(self._cache_path(endpoint, fetch_from.isoformat(), keep), settled_at)
+            if cached is None:
+                break
+            records.extend(cached)
+            fetch_from += timedelta(days=1)
+        if fetch_from > last_day:
+            return records
+        
+        fetched, complete = self._fetch_range(endpoint, self._range_params(endpoint, fetch_from.isoformat(), end), keep)
+        records.extend(fetched)
+        
+        if complete:
+            # Cache each fetched past day, including days without records; until a day has settled its
+            # entry expires like any recent one, so a night that had not synced yet is requested again
+            records_by_day = {}
+            for record in fetched:
+                records_by_day.setdefault(self._record_day(record), []).append(record)
+            while fetch_from <= last_day and fetch_from < today:
+                day = fetch_from.isoformat()
+                self._write_cache(self._cache_path(endpoint, day, keep), records_by_day.get(day, []))
+                fetch_from += timedelta(days=1)
+        return records
+    
+    @staticmethod
+    def index_by_day(records: List[Dict]) -> Dict[str, Dict]:
+        """Index daily records by their 'day' field, keeping the first record for each day."""
+        # Sleep returns several periods per day (long sleep, naps, rest); the first one is scored
+        records_by_day = {}
+        for record in records:
+            if 'day' in record:
+                records_by_day.setdefault(record['day'], record)
+        return records_by_day
+    
+    @staticmethod
+    def closest_record(records_by_day: Dict[str, Dict], date: str) -> Optional[Dict]:
+        """Find the record for a date, falling back to the previous then following day."""
+        if date in records_by_day:
+            return records_by_day[date]
+        
+        target_date = parse_day(date)
+        for offset in (-1, 1):
+            adjacent = (target_date + timedelta(days=offset)).isoformat()
+            if adjacent in records_by_day:
+                return records_by_day[adjacent]
+        return None
+    
+    @staticmethod
+    def is_nighttime_reading(reading: Dict) -> bool:
+        """Check whether a heart rate reading falls between 22:00 and 06:59."""
+        hour = int(reading['timestamp'][11:13])
+        return hour >= 22 or hour <= 6
+    
+    def get_nighttime_heartrate(self, start_date: str, end_date: str) -> Dict[str, float]:
+        """Fetch heart rate once for a date range and average nighttime readings per date."""
+        # A date's night runs from 22:00 the previous evening to 06:59 that morning
+        previous_evening = (parse_day(start_date) - timedelta(days=1)).isoformat()
+        
+        # Running per-night sums and counts, so readings are never collected into lists
+        bpm_totals = {}
+        reading_counts = {}
+        following_day = {}  # Evening date -> date of the night it belongs to
+        # Daytime readings are dropped as each page arrives, so they are never held or cached
+        readings = self.get_range('heartrate', previous_evening, end_date, keep=self.is_nighttime_reading)
+        for reading in readings:
+            # Timestamps are fixed-width ISO 8601 ('YYYY-MM-DDTHH:MM:SS+00:00'), so the date and
+            # hour are sliced out directly rather than building a datetime for every sample
+            timestamp = reading['timestamp']
+            hour = int(timestamp[11:13])
+            if hour >= 22:
+                evening = timestamp[:10]
+                night = following_day.get(evening)
+                if night is None:
+                    night = (parse_day(evening) + timedelta(days=1)).isoformat()
+                    following_day[evening] = night
+            elif hour <= 6:
+                night = timestamp[:10]
             else:
-                print(f" [Error: {response.status_code}]", end="")
-                try:
-                    error_data = response.json()
-                    print(f" {error_data.get('message', 'Unknown error')}", end="")
-                except:
-                    pass
-            return None
-        except Exception as e:
-            print(f" [Exception: {str(e)[:50]}]", end="")
-            return None
+                continue
+            bpm_totals[night] = bpm_totals.get(night, 0) + reading['bpm']
+            reading_counts[night] = reading_counts.get(night, 0) + 1
+        
+        # Whole-day ranges also catch part of the night before start_date and after end_date; drop them
+        return {night: total / reading_counts[night] for night, total in bpm_totals.items()
+                if start_date <= night <= end_date}
+    
+    def fetch_all(self, start_date: str, end_date: str) -> Dict[str, Dict]:
+        """Fetch sleep, readiness, activity and nighttime heart rate for a date range concurrently.
+        
+        Daily records are indexed by day and include one extra day either side of the range so
+        callers can fall back to the closest record; 'heartrate' maps dates to nighttime averages.
+        """
+        range_start = (parse_day(start_date) - timedelta(days=1)).isoformat()
+        range_end = (parse_day(end_date) + timedelta(days=1)).isoformat()
+        daily_endpoints = {'sleep': 'sleep', 'readiness': 'daily_readiness', 'activity': 'daily_activity'}
+        
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            daily_futures = {key: executor.submit(self.get_range, endpoint, range_start, range_end)
+                             for key, endpoint in daily_endpoints.items()}
+            heartrate_future = executor.submit(self.get_nighttime_heartrate, start_date, end_date)
+            
+            results = {key: self.index_by_day(future.result()) for key, future in daily_futures.items()}
+            results['heartrate'] = heartrate_future.result()
+        return results
+    
+    def _daily_record(self, endpoint: str, date: str) -> Optional[Dict]:
+        """Fetch a single day's record using a 3-day window to handle timezone issues."""
+        target_date = parse_day(date)
+        start_date = (target_date - timedelta(days=1)).isoformat()
+        end_date = (target_date + timedelta(days=1)).isoformat()
+        records = self.get_range(endpoint, start_date, end_date)
+        return self.closest_record(self.index_by_day(records), date)
+    
+    def get_sleep_data(self, date: str) -> Optional[Dict]:
+        """Fetch sleep data for a specific date using a broader date range."""
+        return self._daily_record('sleep', date)
 
     def get_readiness_data(self, date: str) -> Optional[Dict]:
         """Fetch readiness data for a specific date using a broader date range."""
-        try:
-            # Use a 3-day window centered on the target date to handle timezone issues
-            target_date = datetime.strptime(date, '%Y-%m-%d')
-            start_date = (target_date - timedelta(days=1)).strftime('%Y-%m-%d')
-            end_date = (target_date + timedelta(days=1)).strftime('%Y-%m-%d')
-            
-            url = f"{self.BASE_URL}/usercollection/daily_readiness"
-            params = {'start_date': start_date, 'end_date': end_date}
-            response = self.session.get(url, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                all_records = data.get('data', [])
-                
-                # Find record that matches our target date
-                for record in all_records:
-                    record_date = record.get('day', '')
-                    if record_date == date:
-                        return record
-                
-                # If no exact match, use the first available record
-                if all_records:
-                    return all_records[0]
-                    
-            return None
-        except Exception as e:
-            print(f"Warning: Readiness data fetch failed for {date}: {e}")
-            return None
+        return self._daily_record('daily_readiness', date)
 
     def get_heartrate_data(self, date: str) -> Optional[float]:
         """Fetch and calculate nighttime resting heart rate for a specific date."""
-        try:
-            # Use a broader time window to ensure we capture nighttime data
-            target_date = datetime.strptime(date, '%Y-%m-%d')
-            start_datetime = (target_date - timedelta(hours=6)).strftime('%Y-%m-%dT18:00:00')
-            end_datetime = (target_date + timedelta(hours=18)).strftime('%Y-%m-%dT12:00:00')
-            
-            url = f"{self.BASE_URL}/usercollection/heartrate"
-            params = {
-                'start_datetime': start_datetime,
-                'end_datetime': end_datetime
-            }
-            response = self.session.get(url, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if not data.get('data'):
-                    return None
-                
-                # Calculate nighttime resting HR (22:00-06:00 in local time)
-                nighttime_readings = []
-                for reading in data['data']:
-                    timestamp = datetime.fromisoformat(reading['timestamp'].replace('Z', '+00:00'))
-                    hour = timestamp.hour
-                    if hour >= 22 or hour <= 6:
-                        nighttime_readings.append(reading['bpm'])
-                
-                if nighttime_readings:
-                    return sum(nighttime_readings) / len(nighttime_readings)
-            return None
-        except Exception as e:
-            print(f"Warning: Heart rate data fetch failed for {date}: {e}")
-            return None
+        return self.get_nighttime_heartrate(date, date).get(date)
 
     def get_activity_data(self, date: str) -> Optional[Dict]:
         """Fetch activity data for a specific date."""
-        try:
-            # Use a 3-day window like other endpoints
-            target_date = datetime.strptime(date, '%Y-%m-%d')
-            start_date = (target_date - timedelta(days=1)).strftime('%Y-%m-%d')
-            end_date = (target_date + timedelta(days=1)).strftime('%Y-%m-%d')
-            
-            url = f"{self.BASE_URL}/usercollection/daily_activity"
-            params = {'start_date': start_date, 'end_date': end_date}
-            response = self.session.get(url, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                all_records = data.get('data', [])
-                
-                # Find record that matches our target date
-                for record in all_records:
-                    record_date = record.get('day', '')
-                    if record_date == date:
-                        return record
-                
-                # If no exact match, use the first available record
-                if all_records:
-                    return all_records[0]
-                    
-            return None
-        except Exception as e:
-            print(f"Warning: Activity data fetch failed for {date}: {e}")
-            return None
+        return self._daily_record('daily_activity', date)
 
 
 class JetLagAnalyser:
@@ -324,41 +527,92 @@ class JetLagAnalyser:
         self.baseline_hr = baseline_hr
         self.baseline_sleep_efficiency = baseline_sleep_efficiency
     
-    def calculate_sleep_midpoint(self, sleep_data: Dict) -> Optional[str]:
-        """Calculate the midpoint of sleep period."""
+    def calculate_sleep_midpoint(self, sleep_data: Dict) -> Optional[int]:
+        """Calculate the midpoint of sleep period as minutes since midnight."""
         try:
-            start = datetime.fromisoformat(sleep_data['bedtime_start'].replace('Z', '+00:00'))
-            end = datetime.fromisoformat(sleep_data['bedtime_end'].replace('Z', '+00:00'))
-            midpoint = start + (end - start) / 2
-            return midpoint.strftime('%H:%M')
-        except (KeyError, ValueError):
+            return self._midpoint_minutes(sleep_data['bedtime_start'], sleep_data['bedtime_end'])
+        except KeyError:
             return None
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _midpoint_minutes(bedtime_start: str, bedtime_end: str) -> Optional[int]:
+        """Parse a bedtime window into its midpoint in minutes since midnight."""
+        # Memoised: closest-day fallbacks and the debug re-score revisit the same sleep record
+        try:
+            start, start_offset = split_timestamp(bedtime_start)
+            end, end_offset = split_timestamp(bedtime_end)
+            # Express the end in the start's UTC offset (they differ across a DST change)
+            end -= timedelta(minutes=end_offset - start_offset)
+        except ValueError:
+            # Less common layouts (e.g. fractional seconds) go through the general parser
+            try:
+                start = datetime.fromisoformat(bedtime_start.replace('Z', '+00:00'))
+                end = datetime.fromisoformat(bedtime_end.replace('Z', '+00:00'))
+            except ValueError:
+                return None
+        midpoint = start + (end - start) / 2
+        return midpoint.hour * 60 + midpoint.minute
     
-    def adjusted_optimal_midpoint(self, timezone_shift: int) -> str:
-        """Calculate optimal sleep midpoint for the destination timezone."""
+    def adjusted_optimal_midpoint(self, timezone_shift: int) -> int:
+        """Calculate optimal sleep midpoint for the destination timezone (minutes since midnight)."""
         # Target should always be local optimal time (03:00), not shifted time
         # The timezone_shift tells us how far we travelled, but we want to adapt to local time
-        base_hour = 3  # 03:00 optimal sleep midpoint in destination timezone
-        return f"{base_hour:02d}:00"
-    
-    def time_difference_hours(self, time1: str, time2: str) -> float:
-        """Calculate circular time difference in hours."""
-        def time_to_minutes(time_str):
-            h, m = map(int, time_str.split(':'))
-            return h * 60 + m
-        
-        minutes1 = time_to_minutes(time1)
-        minutes2 = time_to_minutes(time2)
-        diff = abs(minutes1 - minutes2)
+        return 3 * 60  # 03:00 optimal sleep midpoint in destination timezone
+    
+    def time_difference_hours(self, minutes1: int, minutes2: int) -> float:
+        """Calculate circular time difference in hours between two minutes-since-midnight values."""
+        diff = (minutes1 - minutes2) % 1440
         return min(diff, 1440 - diff) / 60
     
-    def calculate_recovery_score(self, oura_data: Dict, timezone_shift: int, days_since_travel: int) -> Optional[float]:
+    @staticmethod
+    def _alignment_score(time_diff: float) -> float:
+        """Score sleep midpoint alignment from its distance to the target in hours (more lenient ramp)."""
+        if time_diff <= 1.5:
+            return 100
+        if time_diff <= 3.0:
+            return 100 - (time_diff - 1.5) * 40
+        return max(0, 100 - time_diff * 15)
+    
+    @staticmethod
+    def _activity_adjustment(total_calories: float, active_calories: float, training_volume: float) -> int:
+        """Extra heart rate deviation (bpm) to allow after a day's training load."""
+        if total_calories > 3000 or active_calories > 800 or training_volume > 300:
+            return 5  # Heavy training
+        if total_calories > 2500 or active_calories > 500 or training_volume > 200:
+            return 3  # Moderate training
+        return 0
+    
+    @staticmethod
+    def _hr_score(adjusted_deviation: float) -> float:
+        """Score resting heart rate: full marks within 5 bpm of baseline, then 8 points per bpm."""
+        return min(100, max(0, 100 - (adjusted_deviation - 5) * 8))
+    
+    @staticmethod
+    def _temp_score(temp_deviation: float) -> float:
+        """Score temperature rhythm: full marks within 0.1°C, then 200 points per °C."""
+        return min(100, max(0, 100 - (abs(temp_deviation) - 0.1) * 200))
+    
+    def calculate_recovery_score(self, oura_data: Dict, timezone_shift: int,
+                                 days_since_travel: int) -> Optional[float]:
         """Calculate overall recovery score from Oura data, adjusted for activity."""
+        return self._evaluate_recovery(oura_data, timezone_shift, days_since_travel, debug=False)[0]
+    
+    def recovery_components(self, oura_data: Dict, timezone_shift: int, days_since_travel: int) -> Dict:
+        """Calculate the per-component breakdown behind a day's recovery score."""
+        return self._evaluate_recovery(oura_data, timezone_shift, days_since_travel, debug=True)[1]
+    
+    def _evaluate_recovery(self, oura_data: Dict, timezone_shift: int, days_since_travel: int,
+                           debug: bool) -> Tuple[Optional[float], Dict]:
+        """Score a day, returning the score and (only when debug is set) its component breakdown.
+        
+        Nothing is stored on the analyser, so days can be scored independently of one another.
+        """
         if days_since_travel == 0:
-            return 100.0
+            return 100.0, {}
         
         if not any([oura_data.get('sleep'), oura_data.get('readiness'), oura_data.get('resting_hr')]):
-            return None
+            return None, {}
         
         total_weight = 0
         weighted_score = 0
@@ -368,24 +622,18 @@ class JetLagAnalyser:
         sleep_data = oura_data.get('sleep')
         if sleep_data and 'bedtime_start' in sleep_data and 'bedtime_end' in sleep_data:
             sleep_midpoint = self.calculate_sleep_midpoint(sleep_data)
-            if sleep_midpoint:
+            if sleep_midpoint is not None:
                 target_midpoint = self.adjusted_optimal_midpoint(timezone_shift)
                 time_diff = self.time_difference_hours(sleep_midpoint, target_midpoint)
+                alignment = self._alignment_score(time_diff)
                 
-                # More lenient alignment scoring
-                if time_diff <= 1.5:
-                    alignment = 100
-                elif time_diff <= 3.0:
-                    alignment = 100 - (time_diff - 1.5) * 40
-                else:
-                    alignment = max(0, 100 - time_diff * 15)
-                
-                component_scores['sleep_alignment'] = {
-                    'score': alignment,
-                    'sleep_midpoint': sleep_midpoint,
-                    'target_midpoint': target_midpoint,
-                    'time_diff_hours': time_diff
-                }
+                if debug:
+                    component_scores['sleep_alignment'] = {
+                        'score': alignment,
+                        'sleep_midpoint': sleep_midpoint,
+                        'target_midpoint': target_midpoint,
+                        'time_diff_hours': time_diff
+                    }
                 
                 weighted_score += alignment * 0.4
                 total_weight += 0.4
@@ -405,32 +653,28 @@ class JetLagAnalyser:
                 training_volume = activity_data.get('training_volume', 0)
                 
                 # High training load increases expected HR deviation
-                if total_calories > 3000 or active_calories > 800 or training_volume > 300:
-                    activity_adjustment = 5  # Allow 5 bpm extra deviation for heavy training
-                elif total_calories > 2500 or active_calories > 500 or training_volume > 200:
-                    activity_adjustment = 3  # Allow 3 bpm extra for moderate training
+                activity_adjustment = self._activity_adjustment(total_calories, active_calories, training_volume)
                 
-                component_scores['activity_load'] = {
-                    'total_calories': total_calories,
-                    'active_calories': active_calories,
-                    'training_volume': training_volume,
-                    'hr_adjustment': activity_adjustment
-                }
+                if debug:
+                    component_scores['activity_load'] = {
+                        'total_calories': total_calories,
+                        'active_calories': active_calories,
+                        'training_volume': training_volume,
+                        'hr_adjustment': activity_adjustment
+                    }
             
             # Apply activity-adjusted scoring
             adjusted_deviation = max(0, hr_deviation - activity_adjustment)
-            if adjusted_deviation <= 5:
-                hr_recovery = 100
-            else:
-                hr_recovery = max(0, 100 - (adjusted_deviation - 5) * 8)
-            
-            component_scores['hr_recovery'] = {
-                'score': hr_recovery,
-                'current_hr': resting_hr,
-                'baseline_hr': self.baseline_hr,
-                'raw_deviation': hr_deviation,
-                'adjusted_deviation': adjusted_deviation
-            }
+            hr_recovery = self._hr_score(adjusted_deviation)
+            
+            if debug:
+                component_scores['hr_recovery'] = {
+                    'score': hr_recovery,
+                    'current_hr': resting_hr,
+                    'baseline_hr': self.baseline_hr,
+                    'raw_deviation': hr_deviation,
+                    'adjusted_deviation': adjusted_deviation
+                }
             
             weighted_score += hr_recovery * 0.25
             total_weight += 0.25
@@ -439,15 +683,13 @@ class JetLagAnalyser:
         readiness_data = oura_data.get('readiness')
         if readiness_data and readiness_data.get('temperature_trend_deviation') is not None:
             temp_deviation = readiness_data['temperature_trend_deviation']
-            if abs(temp_deviation) <= 0.1:
-                temp_alignment = 100
-            else:
-                temp_alignment = max(0, 100 - (abs(temp_deviation) - 0.1) * 200)
+            temp_alignment = self._temp_score(temp_deviation)
             
-            component_scores['temp_alignment'] = {
-                'score': temp_alignment,
-                'deviation': temp_deviation
-            }
+            if debug:
+                component_scores['temp_alignment'] = {
+                    'score': temp_alignment,
+                    'deviation': temp_deviation
+                }
             
             weighted_score += temp_alignment * 0.2
             total_weight += 0.2
@@ -456,27 +698,53 @@ class JetLagAnalyser:
         if sleep_data and sleep_data.get('efficiency'):
             sleep_quality = min(100, (sleep_data['efficiency'] / self.baseline_sleep_efficiency) * 100)
             
-            component_scores['sleep_quality'] = {
-                'score': sleep_quality,
-                'efficiency': sleep_data['efficiency'],
-                'baseline': self.baseline_sleep_efficiency
-            }
+            if debug:
+                component_scores['sleep_quality'] = {
+                    'score': sleep_quality,
+                    'efficiency': sleep_data['efficiency'],
+                    'baseline': self.baseline_sleep_efficiency
+                }
             
             weighted_score += sleep_quality * 0.15
             total_weight += 0.15
         
         final_score = (weighted_score / total_weight) if total_weight > 0.3 else None
         
-        # Store component scores for debugging
-        self.debug_components = component_scores
-        
-        return final_score
+        return final_score, component_scores
+
+
+class DataSource(IntFlag):
+    """Oura data sources that contributed to a day's recovery score, packed into one int."""
+    NONE = 0
+    SLEEP = 1
+    READINESS = 2
+    HEARTRATE = 4
+    ACTIVITY = 8
+
+
+@dataclass
+class DayRecord:
+    """Recovery score and headline metrics for one day of the analysis window."""
+    # Explicit slots keep per-day records compact (dataclass(slots=True) needs Python 3.10+)
+    __slots__ = ('day', 'date', 'recovery_score', 'sleep_efficiency', 'resting_hr', 'temp_deviation',
+                 'active_calories', 'training_volume', 'is_baseline', 'data_quality')
+    day: int
+    date: str
+    recovery_score: Optional[float]
+    sleep_efficiency: Optional[float]
+    resting_hr: Optional[float]
+    temp_deviation: Optional[float]
+    active_calories: Optional[int]
+    training_volume: Optional[int]
+    is_baseline: bool
+    data_quality: DataSource
 
 
 class JetLagTracker:
     """Main application class."""
     
-    def __init__(self):
+    def __init__(self, verbose: bool = False):
+        self.verbose = verbose
         self.oura_client = None
         self.airport_db = AirportDatabase()
         self.analyser = JetLagAnalyser()
@@ -508,7 +776,7 @@ class JetLagTracker:
             print(f"Warning: Could not load saved API key: {e}")
         return None
     
-    def get_user_input(self) -> Tuple[str, str, str, str]:
+    def get_user_input(self) -> Tuple[str, datetime, str, str]:
         """Collect simplified user input for analysis."""
         print("\n📱 Jet Lag Recovery Tracker")
         print("=" * 50)
@@ -557,8 +825,8 @@ class JetLagTracker:
         print("\n✈️  Travel Details")
         departure = input("Departure date and time (YYYY-MM-DDTHH:MM): ").strip()
         try:
-            # Validate date format
-            datetime.fromisoformat(departure)
+            # Validate date format, keeping the parsed value for the analysis
+            travel_date = datetime.fromisoformat(departure)
         except ValueError:
             print("❌ Invalid date format. Use YYYY-MM-DDTHH:MM")
             sys.exit(1)
@@ -590,7 +858,7 @@ class JetLagTracker:
             print(f"   Supported airports: {', '.join(sorted(self.airport_db.airports.keys()))}")
             sys.exit(1)
         
-        return token, departure, departure_airport, arrival_airport
+        return token, travel_date, departure_airport, arrival_airport
     
     def calculate_route_details(self, departure_code: str, arrival_code: str) -> bool:
         """Calculate route details from airport codes."""
@@ -600,10 +868,10 @@ class JetLagTracker:
             self.route_details = self.airport_db.calculate_route_details(departure_code, arrival_code)
             
             print(f"✅ Route calculated:")
-            print(f"   From: {self.route_details['departure']['city']} ({departure_code}) - {self.route_details['departure']['name']}")
-            print(f"   To: {self.route_details['arrival']['city']} ({arrival_code}) - {self.route_details['arrival']['name']}")
-            print(f"   Timezone shift: {self.route_details['timezone_shift']:+d} hours")
-            print(f"   Direction: {self.route_details['direction']}ward")
+            print(f"   From: {self.route_details.departure.city} ({departure_code}) - {self.route_details.departure.name}")
+            print(f"   To: {self.route_details.arrival.city} ({arrival_code}) - {self.route_details.arrival.name}")
+            print(f"   Timezone shift: {self.route_details.timezone_shift:+d} hours")
+            print(f"   Direction: {self.route_details.direction}ward")
             
             return True
             
@@ -613,12 +881,21 @@ class JetLagTracker:
     
     def generate_recommendations(self, recovery_score: float, direction: str, days_since_travel: int) -> List[str]:
         """Generate personalised recovery recommendations."""
+        # Every rule threshold is a multiple of 5 points and none looks past day 21, so flooring the
+        # score to 5 points and capping the day count gives the same advice with far fewer cache keys
+        score_floor = recovery_score // 5 * 5
+        return list(self._recommendations(score_floor, direction, min(days_since_travel, 22)))
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)  # Covers every (score floor, direction, capped day) combination
+    def _recommendations(recovery_score: float, direction: str, days_since_travel: int) -> Tuple[str, ...]:
+        """Evaluate the recommendation rules (pure, so results are memoised)."""
         recommendations = []
         
         # Fixed threshold logic
         if recovery_score >= 90 or days_since_travel > 21:
             recommendations.append("🎯 Full recovery achieved! Your circadian rhythm should be completely adapted.")
-            return recommendations
+            return tuple(recommendations)
         
         if recovery_score < 75:
             if direction == 'east':
@@ -635,71 +912,68 @@ class JetLagTracker:
         if recovery_score < 80 and days_since_travel > 14:
             recommendations.append("🔄 Consider adjusting sleep schedule gradually - 15 minutes earlier/later each night")
         
-        return recommendations
+        return tuple(recommendations)
     
-    def fetch_recovery_data(self, departure_date: str, timezone_shift: int) -> bool:
+    def fetch_recovery_data(self, travel_date: datetime, days_since_travel: int, timezone_shift: int) -> bool:
         """Fetch and analyse recovery data."""
-        travel_date = datetime.fromisoformat(departure_date)
-        today = datetime.now()
-        days_since_travel = (today.date() - travel_date.date()).days
-        
         print(f"\n📊 Analysing {min(days_since_travel, 14)} days of data...")
         print(f"Travel date: {travel_date.strftime('%Y-%m-%d %H:%M')}")
         print(f"Days since travel: {days_since_travel}")
         
         # Baseline data point
-        self.recovery_data.append({
-            'day': 0,
-            'date': travel_date.strftime('%Y-%m-%d'),
-            'recovery_score': 100.0,
-            'sleep_efficiency': self.analyser.baseline_sleep_efficiency,
-            'resting_hr': self.analyser.baseline_hr,
-            'temp_deviation': 0.0,
-            'is_baseline': True
-        })
+        travel_day = travel_date.date()
+        self.recovery_data.append(DayRecord(
+            day=0,
+            date=travel_day.isoformat(),
+            recovery_score=100.0,
+            sleep_efficiency=self.analyser.baseline_sleep_efficiency,
+            resting_hr=self.analyser.baseline_hr,
+            temp_deviation=0.0,
+            active_calories=None,
+            training_volume=None,
+            is_baseline=True,
+            data_quality=DataSource.NONE
+        ))
         
         days_to_fetch = min(days_since_travel, 14)
         successful_days = 0
+        latest_scored = None
+        # Date axis for days 1..N, formatted once and shared by the fetch and scoring loop
+        date_strs = [(travel_day + timedelta(days=day)).isoformat()
+                     for day in range(1, days_to_fetch + 1)]
         
-        for day in range(1, days_to_fetch + 1):
-            current_date = travel_date + timedelta(days=day)
-            date_str = current_date.strftime('%Y-%m-%d')
-            
-            print(f"  Day {day}: {date_str}", end="")
-            
-            # Fetch all data types with debugging
-            sleep_data = self.oura_client.get_sleep_data(date_str)
-            readiness_data = self.oura_client.get_readiness_data(date_str)
-            resting_hr = self.oura_client.get_heartrate_data(date_str)
+        # One concurrent request per endpoint covers the whole window
+        client = self.oura_client
+        sleep_by_day, readiness_by_day, activity_by_day, heartrate_by_day = {}, {}, {}, {}
+        if date_strs:
+            fetched = client.fetch_all(date_strs[0], date_strs[-1])
+            sleep_by_day = fetched['sleep']
+            readiness_by_day = fetched['readiness']
+            activity_by_day = fetched['activity']
+            heartrate_by_day = fetched['heartrate']
+        
+        print(f"  Sleep records: {len(sleep_by_day)} | Readiness: {len(readiness_by_day)} | "
+              f"Activity: {len(activity_by_day)} | Heart rate nights: {len(heartrate_by_day)}")
+        
+        for day, date_str in enumerate(date_strs, 1):
+            sleep_data = client.closest_record(sleep_by_day, date_str)
+            readiness_data = client.closest_record(readiness_by_day, date_str)
+            resting_hr = heartrate_by_day.get(date_str)
+            activity_data = client.closest_record(activity_by_day, date_str)
             
-            # Try to fetch activity data (may not be available for all days)
-            activity_data = None
-            try:
-                # Add manual activity fetch since we're adding this functionality
-                target_date = datetime.strptime(date_str, '%Y-%m-%d')
-                start_date = (target_date - timedelta(days=1)).strftime('%Y-%m-%d')
-                end_date = (target_date + timedelta(days=1)).strftime('%Y-%m-%d')
-                
-                activity_response = self.oura_client.session.get(
-                    f"{self.oura_client.BASE_URL}/usercollection/daily_activity",
-                    params={'start_date': start_date, 'end_date': end_date}
-                )
-                
-                if activity_response.status_code == 200:
-                    activity_json = activity_response.json()
-                    activity_records = activity_json.get('data', [])
-                    # Find matching date
-                    for record in activity_records:
-                        if record.get('day', '') == date_str:
-                            activity_data = record
-                            active_calories = record.get('active_calories', 0)
-                            training_volume = record.get('training_volume', 0)
-                            print(f" [Act: {active_calories}cal, Vol: {training_volume}]", end="")
-                            break
-                    if not activity_data and activity_records:
-                        activity_data = activity_records[0]  # Use closest
-            except Exception as e:
-                print(f" [Act: Error]", end="")
+            # Build the day's status line in memory and write it once
+            status_parts = [f"  Day {day}: {date_str}"]
+            if sleep_data:
+                if sleep_data.get('day') == date_str:
+                    status_parts.append(f" [Eff: {sleep_data.get('efficiency', 'N/A')}%]")
+                else:
+                    status_parts.append(f" [Using closest: {sleep_data.get('day', 'unknown')}]")
+            else:
+                status_parts.append(" [No sleep data]")
+            if activity_data and activity_data.get('day') == date_str:
+                active_calories = activity_data.get('active_calories', 0)
+                training_volume = activity_data.get('training_volume', 0)
+                status_parts.append(f" [Act: {active_calories}cal, Vol: {training_volume}]")
             
             oura_data = {
                 'sleep': sleep_data,
@@ -712,34 +986,40 @@ class JetLagTracker:
             recovery_score = self.analyser.calculate_recovery_score(oura_data, timezone_shift, day)
             
             if recovery_score is not None:
-                # Store debug components for the most recent successful calculation
-                if hasattr(self.analyser, 'debug_components') and self.analyser.debug_components:
-                    self.latest_debug_components = self.analyser.debug_components.copy()
-                
-                self.recovery_data.append({
-                    'day': day,
-                    'date': date_str,
-                    'recovery_score': recovery_score,
-                    'sleep_efficiency': sleep_data.get('efficiency') if sleep_data else None,
-                    'resting_hr': resting_hr,
-                    'temp_deviation': readiness_data.get('temperature_trend_deviation') if readiness_data else None,
-                    'active_calories': activity_data.get('active_calories') if activity_data else None,
-                    'training_volume': activity_data.get('training_volume') if activity_data else None,
-                    'is_baseline': False,
-                    'data_quality': {
-                        'has_sleep': bool(sleep_data),
-                        'has_readiness': bool(readiness_data),
-                        'has_heartrate': bool(resting_hr),
-                        'has_activity': bool(activity_data)
-                    }
-                })
+                latest_scored = (day, oura_data)
+                data_quality = DataSource.NONE
+                if sleep_data:
+                    data_quality |= DataSource.SLEEP
+                if readiness_data:
+                    data_quality |= DataSource.READINESS
+                if resting_hr:
+                    data_quality |= DataSource.HEARTRATE
+                if activity_data:
+                    data_quality |= DataSource.ACTIVITY
+                self.recovery_data.append(DayRecord(
+                    day=day,
+                    date=date_str,
+                    recovery_score=recovery_score,
+                    sleep_efficiency=sleep_data.get('efficiency') if sleep_data else None,
+                    resting_hr=resting_hr,
+                    temp_deviation=readiness_data.get('temperature_trend_deviation') if readiness_data else None,
+                    active_calories=activity_data.get('active_calories') if activity_data else None,
+                    training_volume=activity_data.get('training_volume') if activity_data else None,
+                    is_baseline=False,
+                    data_quality=data_quality
+                ))
                 successful_days += 1
-                print(f" ✅ Recovery: {recovery_score:.1f}%")
+                status_parts.append(f" ✅ Recovery: {recovery_score:.1f}%")
             else:
-                print(" ❌ Insufficient data")
+                status_parts.append(" ❌ Insufficient data")
             
-            # Rate limiting
-            time.sleep(0.2)
+            sys.stdout.write("".join(status_parts) + "\n")
+        
+        # Only the most recent successful day's breakdown is displayed, so build it just for that day
+        if latest_scored:
+            latest_day, latest_oura_data = latest_scored
+            self.latest_debug_components = self.analyser.recovery_components(
+                latest_oura_data, timezone_shift, latest_day)
         
         if successful_days == 0:
             print(f"\n❌ No valid Oura data found for the travel period.")
@@ -755,112 +1035,119 @@ class JetLagTracker:
             return
         
         # Get latest valid recovery score
-        valid_data = [d for d in self.recovery_data if not d['is_baseline'] and d['recovery_score'] is not None]
+        valid_data = [d for d in self.recovery_data if not d.is_baseline and d.recovery_score is not None]
         if not valid_data:
             print("❌ No valid recovery data to display")
             return
         
         latest = valid_data[-1]
-        current_recovery = latest['recovery_score']
+        current_recovery = latest.recovery_score
         
-        print("\n" + "=" * 60)
-        print("📈 JET LAG RECOVERY ANALYSIS")
-        print("=" * 60)
+        # Collect the report and write it in one go rather than line by line
+        out = ["\n" + "=" * 60]
+        out.append("📈 JET LAG RECOVERY ANALYSIS")
+        out.append("=" * 60)
         
         # Show route information if available
         if self.route_details:
-            print(f"\n✈️  Route: {self.route_details['departure']['city']} → {self.route_details['arrival']['city']}")
-            print(f"   Airports: {self.route_details['departure']['iata']} → {self.route_details['arrival']['iata']}")
+            out.append(f"\n✈️  Route: {self.route_details.departure.city} → {self.route_details.arrival.city}")
+            out.append(f"   Airports: {self.route_details.departure.iata} → {self.route_details.arrival.iata}")
         
         # Recovery status
-        status_emoji = "🎯" if current_recovery >= 90 else "🔶" if current_recovery >= 70 else "🔴"
-        print(f"\n{status_emoji} Current Recovery: {current_recovery:.1f}%")
+        status_emoji = next((emoji for threshold, emoji in RECOVERY_STATUS_EMOJI if current_recovery >= threshold), "🔴")
+        out.append(f"\n{status_emoji} Current Recovery: {current_recovery:.1f}%")
         
         # Latest metrics
-        print(f"\n📊 Latest Metrics (Day {latest['day']}):")
-        if latest['resting_hr']:
-            print(f"   ❤️  Resting HR: {latest['resting_hr']:.1f} bpm")
-        if latest['sleep_efficiency']:
-            print(f"   😴 Sleep Efficiency: {latest['sleep_efficiency']:.1f}%")
-        if latest['temp_deviation'] is not None:
-            print(f"   🌡️  Temperature Deviation: {latest['temp_deviation']:+.2f}°C")
-        if latest.get('active_calories'):
-            print(f"   🏃 Active Calories: {latest['active_calories']}")
-        if latest.get('training_volume'):
-            print(f"   💪 Training Volume: {latest['training_volume']}")
+        out.append(f"\n📊 Latest Metrics (Day {latest.day}):")
+        if latest.resting_hr:
+            out.append(f"   ❤️  Resting HR: {latest.resting_hr:.1f} bpm")
+        if latest.sleep_efficiency:
+            out.append(f"   😴 Sleep Efficiency: {latest.sleep_efficiency:.1f}%")
+        if latest.temp_deviation is not None:
+            out.append(f"   🌡️  Temperature Deviation: {latest.temp_deviation:+.2f}°C")
+        if latest.active_calories:
+            out.append(f"   🏃 Active Calories: {latest.active_calories}")
+        if latest.training_volume:
+            out.append(f"   💪 Training Volume: {latest.training_volume}")
         
         # Debug component breakdown for latest day
         if hasattr(self, 'latest_debug_components'):
-            print(f"\n🔍 Recovery Component Breakdown (Day {latest['day']}):")
+            out.append(f"\n🔍 Recovery Component Breakdown (Day {latest.day}):")
             components = self.latest_debug_components
             
             if 'sleep_alignment' in components:
                 sa = components['sleep_alignment']
-                print(f"   🕐 Sleep Alignment: {sa['score']:.1f}% (40% weight)")
-                print(f"      Sleep midpoint: {sa['sleep_midpoint']} | Target: {sa['target_midpoint']}")
-                print(f"      Time difference: {sa['time_diff_hours']:.1f} hours")
+                out.append(f"   🕐 Sleep Alignment: {sa['score']:.1f}% (40% weight)")
+                sleep_midpoint, target_midpoint = sa['sleep_midpoint'], sa['target_midpoint']
+                out.append(f"      Sleep midpoint: {sleep_midpoint // 60:02d}:{sleep_midpoint % 60:02d} | "
+                      f"Target: {target_midpoint // 60:02d}:{target_midpoint % 60:02d}")
+                out.append(f"      Time difference: {sa['time_diff_hours']:.1f} hours")
             
             if 'hr_recovery' in components:
                 hr = components['hr_recovery']
-                print(f"   ❤️  Heart Rate: {hr['score']:.1f}% (25% weight)")
-                print(f"      Current: {hr['current_hr']:.1f} | Baseline: {hr['baseline_hr']:.1f}")
-                print(f"      Raw deviation: {hr['raw_deviation']:.1f} | Adjusted: {hr['adjusted_deviation']:.1f}")
+                out.append(f"   ❤️  Heart Rate: {hr['score']:.1f}% (25% weight)")
+                out.append(f"      Current: {hr['current_hr']:.1f} | Baseline: {hr['baseline_hr']:.1f}")
+                out.append(f"      Raw deviation: {hr['raw_deviation']:.1f} | Adjusted: {hr['adjusted_deviation']:.1f}")
             
             if 'activity_load' in components:
                 act = components['activity_load']
-                print(f"   🏃 Activity Load:")
-                print(f"      Active calories: {act['active_calories']} | Training volume: {act['training_volume']}")
-                print(f"      HR adjustment: +{act['hr_adjustment']} bpm allowance")
+                out.append(f"   🏃 Activity Load:")
+                out.append(f"      Active calories: {act['active_calories']} | Training volume: {act['training_volume']}")
+                out.append(f"      HR adjustment: +{act['hr_adjustment']} bpm allowance")
             
             if 'temp_alignment' in components:
                 temp = components['temp_alignment']
-                print(f"   🌡️  Temperature: {temp['score']:.1f}% (20% weight)")
-                print(f"      Deviation: {temp['deviation']:+.2f}°C")
+                out.append(f"   🌡️  Temperature: {temp['score']:.1f}% (20% weight)")
+                out.append(f"      Deviation: {temp['deviation']:+.2f}°C")
             
             if 'sleep_quality' in components:
                 sq = components['sleep_quality']
-                print(f"   😴 Sleep Quality: {sq['score']:.1f}% (15% weight)")
-                print(f"      Efficiency: {sq['efficiency']:.1f}% | Baseline: {sq['baseline']:.1f}%")
+                out.append(f"   😴 Sleep Quality: {sq['score']:.1f}% (15% weight)")
+                out.append(f"      Efficiency: {sq['efficiency']:.1f}% | Baseline: {sq['baseline']:.1f}%")
         
         # Data quality summary
-        total_days = len([d for d in self.recovery_data if not d['is_baseline']])
-        sleep_days = len([d for d in valid_data if d['data_quality']['has_sleep']])
-        hr_days = len([d for d in valid_data if d['data_quality']['has_heartrate']])
-        readiness_days = len([d for d in valid_data if d['data_quality']['has_readiness']])
-        activity_days = len([d for d in valid_data if d['data_quality']['has_activity']])
-        
-        print(f"\n📈 Data Quality:")
-        print(f"   Total days analysed: {total_days}")
-        print(f"   Sleep records: {sleep_days}")
-        print(f"   Heart rate data: {hr_days}")
-        print(f"   Readiness data: {readiness_days}")
-        print(f"   Activity data: {activity_days}")
+        total_days = sum(1 for d in self.recovery_data if not d.is_baseline)
+        sleep_days = hr_days = readiness_days = activity_days = 0
+        for d in valid_data:
+            data_quality = d.data_quality
+            sleep_days += DataSource.SLEEP in data_quality
+            hr_days += DataSource.HEARTRATE in data_quality
+            readiness_days += DataSource.READINESS in data_quality
+            activity_days += DataSource.ACTIVITY in data_quality
+        
+        out.append(f"\n📈 Data Quality:")
+        out.append(f"   Total days analysed: {total_days}")
+        out.append(f"   Sleep records: {sleep_days}")
+        out.append(f"   Heart rate data: {hr_days}")
+        out.append(f"   Readiness data: {readiness_days}")
+        out.append(f"   Activity data: {activity_days}")
         
         # Recommendations
         recommendations = self.generate_recommendations(current_recovery, direction, days_since_travel)
         if recommendations:
-            print(f"\n💡 Personalised Recommendations:")
+            out.append(f"\n💡 Personalised Recommendations:")
             for i, rec in enumerate(recommendations, 1):
-                print(f"   {i}. {rec}")
+                out.append(f"   {i}. {rec}")
         
         # Recovery trend
-        print(f"\n📉 Recovery Trend:")
-        for data_point in self.recovery_data:
-            if data_point['is_baseline']:
-                print(f"   Day {data_point['day']:2d}: {data_point['recovery_score']:5.1f}% (Baseline)")
-            elif data_point['recovery_score'] is not None:
-                print(f"   Day {data_point['day']:2d}: {data_point['recovery_score']:5.1f}%")
-            else:
-                print(f"   Day {data_point['day']:2d}: No data")
+        out.append(f"\n📉 Recovery Trend:")
+        out.extend([
+            TREND_BASELINE_TEMPLATE.format(d.day, d.recovery_score) if d.is_baseline
+            else TREND_SCORE_TEMPLATE.format(d.day, d.recovery_score) if d.recovery_score is not None
+            else TREND_NO_DATA_TEMPLATE.format(d.day)
+            for d in self.recovery_data
+        ])
+        
+        sys.stdout.write("\n".join(out) + "\n")
     
     def run(self):
         """Main application execution."""
         try:
             # Get simplified user input
-            token, departure, departure_airport, arrival_airport = self.get_user_input()
+            token, travel_date, departure_airport, arrival_airport = self.get_user_input()
             
             # Initialise Oura client
-            self.oura_client = OuraAPIClient(token)
+            self.oura_client = OuraAPIClient(token, verbose=self.verbose)
             
             # Verify API access
             if not self.oura_client.verify_endpoints():
@@ -871,35 +1158,30 @@ class JetLagTracker:
                 sys.exit(1)
             
             # Use calculated route data
-            destination = f"{self.route_details['arrival']['city']} ({arrival_airport})"
-            timezone_shift = self.route_details['timezone_shift']
-            direction = self.route_details['direction']
+            destination = f"{self.route_details.arrival.city} ({arrival_airport})"
+            timezone_shift = self.route_details.timezone_shift
+            direction = self.route_details.direction
             
             print(f"\n📋 Travel Summary:")
-            print(f"   Route: {self.route_details['departure']['city']} → {self.route_details['arrival']['city']}")
+            print(f"   Route: {self.route_details.departure.city} → {self.route_details.arrival.city}")
             print(f"   Airports: {departure_airport} → {arrival_airport}")
             print(f"   Timezone shift: {timezone_shift:+d} hours")
             print(f"   Direction: {direction}ward")
             
+            days_since_travel = (date.today() - travel_date.date()).days
+            
             # Fetch and analyse data
-            if not self.fetch_recovery_data(departure, timezone_shift):
+            if not self.fetch_recovery_data(travel_date, days_since_travel, timezone_shift):
                 sys.exit(1)
             
-            # Calculate days since travel
-            travel_date = datetime.fromisoformat(departure)
-            days_since_travel = (datetime.now().date() - travel_date.date()).days
-            
             # Display results
             self.display_results(direction, days_since_travel)
             
         except KeyboardInterrupt:
             print("\n\n👋 Analysis cancelled by user")
             sys.exit(0)
-        except Exception as e:
-            print(f"\n❌ Unexpected error: {e}")
-            sys.exit(1)
 
 
 if __name__ == "__main__":
-    tracker = JetLagTracker()
+    tracker = JetLagTracker(verbose='--verbose' in sys.argv[1:])
     tracker.run()
\ No newline at end of file
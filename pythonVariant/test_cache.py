@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-day Oura response cache in OuraAPIClient.get_range.
+Run with: python3 -m unittest test_cache
+"""
+
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import date, datetime, timedelta
+
+from jetlag_recovery_tracker import OuraAPIClient
+
+
+class CacheTest(unittest.TestCase):
+    """Hit, expiry and settled rules of the per-day cache."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.client = OuraAPIClient('test-token')
+        self.client.CACHE_DIR = self.cache_dir
+        self.requests = []
+        self.client._fetch_range = self.fake_fetch
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def fake_fetch(self, endpoint, params, keep=None):
+        """Record the requested range and return one record per day in it."""
+        self.requests.append((params['start_date'], params['end_date']))
+        day, end = date.fromisoformat(params['start_date']), date.fromisoformat(params['end_date'])
+        records = []
+        while day <= end:
+            records.append({'day': day.isoformat(), 'efficiency': 90})
+            day += timedelta(days=1)
+        return records, True
+
+    def days_ago(self, days):
+        return (date.today() - timedelta(days=days)).isoformat()
+
+    def write_entry(self, day, records, fetched_at):
+        """Store a cache entry for one sleep day as if it had been fetched at the given time."""
+        path = self.client._cache_path('sleep', day)
+        self.client._write_cache(path, records)
+        with open(path) as f:
+            entry = json.load(f)
+        entry['fetched_at'] = fetched_at
+        with open(path, 'w') as f:
+            json.dump(entry, f)
+
+    def test_fresh_entry_is_served_without_a_request(self):
+        day = self.days_ago(3)
+        self.write_entry(day, [{'day': day, 'efficiency': 70}], time.time())
+        self.assertEqual(self.client.get_range('sleep', day, day), [{'day': day, 'efficiency': 70}])
+        self.assertEqual(self.requests, [])
+
+    def test_recent_entry_expires_after_ttl(self):
+        day = self.days_ago(3)
+        self.write_entry(day, [], time.time() - self.client.RECENT_CACHE_TTL - 60)
+        self.assertEqual(self.client.get_range('sleep', day, day), [{'day': day, 'efficiency': 90}])
+        self.assertEqual(self.requests, [(day, day)])
+
+    def test_entry_fetched_after_settling_never_expires(self):
+        day = self.days_ago(30)
+        settled = date.fromisoformat(day) + timedelta(days=self.client.SETTLED_AFTER_DAYS + 1)
+        self.write_entry(day, [], datetime(settled.year, settled.month, settled.day).timestamp())
+        self.assertEqual(self.client.get_range('sleep', day, day), [])
+        self.assertEqual(self.requests, [])
+
+    def test_entry_fetched_before_settling_expires_once_day_is_old(self):
+        # Written the day after the night, before the ring synced; the day is now long past
+        day = self.days_ago(9)
+        self.write_entry(day, [], time.time() - 8 * 24 * 60 * 60)
+        self.assertEqual(self.client.get_range('sleep', day, day), [{'day': day, 'efficiency': 90}])
+        self.assertEqual(self.requests, [(day, day)])
+
+    def test_fetch_starts_at_first_miss_and_caches_each_day(self):
+        first, second, third = self.days_ago(5), self.days_ago(4), self.days_ago(3)
+        self.write_entry(first, [{'day': first, 'efficiency': 70}], time.time())
+        records = self.client.get_range('sleep', first, third)
+        self.assertEqual([record['day'] for record in records], [first, second, third])
+        self.assertEqual(self.requests, [(second, third)])
+
+        # Every day is now cached, so a repeat run makes no request
+        self.client.get_range('sleep', first, third)
+        self.assertEqual(len(self.requests), 1)
+
+    def test_today_is_always_fetched(self):
+        today = self.days_ago(0)
+        self.client.get_range('sleep', today, today)
+        self.client.get_range('sleep', today, today)
+        self.assertEqual(self.requests, [(today, today), (today, today)])
+
+
+if __name__ == '__main__':
+    unittest.main()